@@ -1,15 +1,36 @@
+import os
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from enum import IntEnum
+from functools import lru_cache
 from typing import Any, Callable, Sequence
 
+import matplotlib
+
+# With no display to show the figure on there is no need to start up a GUI
+# backend, so just use Agg to save the plot.
+if sys.platform.startswith("linux") and not (
+    os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+):
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
 import numpy as np
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from bs4 import BeautifulSoup, SoupStrainer
 from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 from matplotlib.ticker import FuncFormatter
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional. Without it leg_stats() just runs as plain numpy.
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 
 class MightHikeLocation(IntEnum):
     """All of the Might Hike locations.
@@ -48,6 +69,7 @@ class MightHikeLocation(IntEnum):
     Norfolk_Coast = 20427
 
 
+@lru_cache(maxsize=4096)
 def seconds_to_human_time(seconds: int) -> str:
     """Convert number of seconds to str of human readable time.
     Will return H:MM:SS if the time spans into the hours. It will return MM:SS
@@ -74,6 +96,122 @@ def seconds_to_human_time(seconds: int) -> str:
     return "{:2d}s".format(seconds)
 
 
+@lru_cache(maxsize=256)
+def seconds_to_hours_mins(secs: float, pos: int | None = None) -> str:
+    """Convert seconds to H:MM format. The unused pos is the tick position
+    given by FuncFormatter."""
+    hours = int(secs // 3600)
+    minutes = int((secs % 3600) // 60)
+    return "{:d}:{:02d}".format(hours, minutes)
+
+
+# The default tick formatter for the time axes, shared by every People.
+TIME_FORMATTER = FuncFormatter(seconds_to_hours_mins)
+
+
+# Times are stored as seconds since midnight. Differences between them are
+# taken modulo a day so a leg that runs past midnight is still positive.
+SECONDS_IN_A_DAY = 86400
+
+
+def datetime_to_seconds(time: datetime) -> int:
+    """Convert the time of day of a datetime to the number of seconds since
+    midnight.
+
+    Parameters
+    ----------
+    time: datetime
+        The datetime to convert.
+
+    Returns
+    -------
+    seconds: int
+        The number of seconds since midnight.
+    """
+    return time.hour * 3600 + time.minute * 60 + time.second
+
+
+def seconds_to_time_of_day(seconds: int) -> str:
+    """Convert a number of seconds since midnight to a time of day string in
+    HH:MM:SS format.
+
+    Parameters
+    ----------
+    seconds: int
+        The number of seconds since midnight.
+
+    Returns
+    -------
+    time_string: str
+        The time of day as a string.
+    """
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    seconds = int(seconds % 60)
+    return "{:02d}:{:02d}:{:02d}".format(hours, minutes, seconds)
+
+
+def time_string_to_seconds(time: str, time_format: str = "%H:%M:%S") -> int:
+    """Convert a time of day string to the number of seconds since midnight.
+    The default `HH:MM:SS` format is split up directly as this is much faster
+    than datetime.strptime. Any other format is parsed with strptime.
+
+    Parameters
+    ----------
+    time: str
+        The time string to convert.
+
+    KwArgs
+    ------
+    time_format: str = "%H:%M:%S"
+        The format of the time string. See Person for more info.
+
+    Returns
+    -------
+    seconds: int
+        The number of seconds since midnight.
+    """
+    if time_format == "%H:%M:%S":
+        hours, minutes, seconds = time.split(":")
+        return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+    return datetime_to_seconds(datetime.strptime(time, time_format))
+
+
+@njit(cache=True)
+def leg_stats(times: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the leg times and the fastest and slowest time for each leg. This is
+    compiled with numba when it is installed.
+
+    Parameters
+    ----------
+    times: np.ndarray
+        An int64 array of times in seconds with a row for each person and a
+        column for each of the start, pitstop_1, pitstop_2, pitstop_3 and
+        finish times. Times are seconds since midnight, so a leg that runs
+        past midnight wraps round to the next day.
+
+    Returns
+    -------
+    legs: np.ndarray
+        The time for each leg with a row for each person and a column for
+        each leg.
+
+    mins: np.ndarray
+        The fastest time for each leg.
+
+    maxs: np.ndarray
+        The slowest time for each leg.
+    """
+    legs = (times[:, 1:] - times[:, :-1]) % SECONDS_IN_A_DAY
+    mins = np.zeros(legs.shape[1], dtype=np.int64)
+    maxs = np.zeros(legs.shape[1], dtype=np.int64)
+    if legs.shape[0] > 0:
+        for leg in range(legs.shape[1]):
+            mins[leg] = legs[:, leg].min()
+            maxs[leg] = legs[:, leg].max()
+    return legs, mins, maxs
+
+
 class Person:
     """Takes in a persons name, race number and times and has helper methods
     to get information about the persons times.
@@ -107,8 +245,36 @@ class Person:
         This is the time format for each of the times given above. The default
         is Hours:Mins:Seconds seperated by `:` characters. This is the format
         given by the official results page.
+
+    Attributes
+    ----------
+    start, pitstop_1, pitstop_2, pitstop_3, finish: int
+        Each of the times given above as the number of seconds since midnight.
+
+    leg_times: tuple[int, int, int, int]
+        The time in seconds for each of the 4 legs.
     """
 
+    __slots__ = (
+        "name",
+        "first_name",
+        "race_number",
+        "start",
+        "pitstop_1",
+        "pitstop_2",
+        "pitstop_3",
+        "finish",
+        "leg_times",
+    )
+
+    # The names of the times each leg starts and ends at.
+    LEG_PAIRS = (
+        ("start", "pitstop_1"),
+        ("pitstop_1", "pitstop_2"),
+        ("pitstop_2", "pitstop_3"),
+        ("pitstop_3", "finish"),
+    )
+
     def __init__(
         self,
         name: str,
@@ -123,47 +289,38 @@ class Person:
         self.name = name
         self.first_name = name.split(" ")[0]
         self.race_number = race_number
-        self.start = datetime.strptime(start, time_format)
-        self.pitstop_1 = datetime.strptime(pitstop_1, time_format)
-        self.pitstop_2 = datetime.strptime(pitstop_2, time_format)
-        self.pitstop_3 = datetime.strptime(pitstop_3, time_format)
-        self.finish = datetime.strptime(finish, time_format)
+        self.start = time_string_to_seconds(start, time_format)
+        self.pitstop_1 = time_string_to_seconds(pitstop_1, time_format)
+        self.pitstop_2 = time_string_to_seconds(pitstop_2, time_format)
+        self.pitstop_3 = time_string_to_seconds(pitstop_3, time_format)
+        self.finish = time_string_to_seconds(finish, time_format)
+        self.leg_times = tuple(
+            (getattr(self, leg_end) - getattr(self, leg_start)) % SECONDS_IN_A_DAY
+            for leg_start, leg_end in self.LEG_PAIRS
+        )
 
     def __str__(self) -> str:
         """."""
         string = "Person:\n"
         string += f"    Race No : {self.race_number}\n"
         string += f"       name : {self.name}\n"
-        string += f"       start: {self.start}\n"
-        string += f"   pitstop_1: {self.pitstop_1}\n"
-        string += f"   pitstop_2: {self.pitstop_2}\n"
-        string += f"   pitstop_3: {self.pitstop_3}\n"
-        string += f"     finish : {self.finish}\n"
+        string += f"       start: {seconds_to_time_of_day(self.start)}\n"
+        string += f"   pitstop_1: {seconds_to_time_of_day(self.pitstop_1)}\n"
+        string += f"   pitstop_2: {seconds_to_time_of_day(self.pitstop_2)}\n"
+        string += f"   pitstop_3: {seconds_to_time_of_day(self.pitstop_3)}\n"
+        string += f"     finish : {seconds_to_time_of_day(self.finish)}\n"
         return string
 
     def get_leg_time(self, leg_no: int) -> int:
         """Get the time for a specified leg number in seconds."""
-        match leg_no:
-            case 1:
-                time = self.pitstop_1 - self.start
-                return time.seconds
-            case 2:
-                time = self.pitstop_2 - self.pitstop_1
-                return time.seconds
-            case 3:
-                time = self.pitstop_3 - self.pitstop_2
-                return time.seconds
-            case 4:
-                time = self.finish - self.pitstop_3
-                return time.seconds
-            case _:
-                raise ValueError(f"leg_no out of bounds 1->4 inclusive.")
+        if not 1 <= leg_no <= len(self.leg_times):
+            raise ValueError(f"leg_no out of bounds 1->4 inclusive.")
+        return self.leg_times[leg_no - 1]
 
     @property
     def total_time(self) -> int:
         """The total time in seconds."""
-        time = self.finish - self.start
-        return time.seconds
+        return (self.finish - self.start) % SECONDS_IN_A_DAY
 
 
 class People:
@@ -181,19 +338,57 @@ class People:
         This is an optional time formatting function. This function should
         take in a time in seconds and return a string of the formatted time.
         When this is not defined the time formatting will be done by the
-        seconds_to_hours_mins() method. See this method for more info on
+        seconds_to_hours_mins() function. See this function for more info on
         generating an Callable override.
+
+    Attributes
+    ----------
+    leg_times: np.ndarray
+        The time in seconds each person took for each leg. This has a row for
+        each person in the same order as people and a column for each of the
+        4 legs.
+
+    leg_min_times, leg_max_times: np.ndarray
+        The fastest and slowest time in seconds for each of the 4 legs.
+
+    total_times: np.ndarray
+        The total time in seconds for each person in the same order as people.
+
+    colors: list[str]
+        The color of each persons bars in the same order as people. These are
+        taken in turn from the matplotlib color cycle.
     """
 
     def __init__(
         self,
         people: Sequence[Person],
-        time_fmt_func: Callable[[int], str] | None = None,
+        time_fmt_func: Callable[[float], str] | None = None,
     ):
 
         self.people = people
         self.people.sort(key=lambda p: p.total_time)
 
+        times = np.array(
+            [
+                [
+                    person.start,
+                    person.pitstop_1,
+                    person.pitstop_2,
+                    person.pitstop_3,
+                    person.finish,
+                ]
+                for person in self.people
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 5)
+        self.leg_times, self.leg_min_times, self.leg_max_times = leg_stats(times)
+        self.total_times = (times[:, 4] - times[:, 0]) % SECONDS_IN_A_DAY
+
+        cycle_colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+        self.colors = [
+            cycle_colors[i % len(cycle_colors)] for i in range(len(self.people))
+        ]
+
         set_of_names = set(person.name for person in self.people)
         if len(set_of_names) == len(self.people):
             self.use_first_name_in_plots = True
@@ -201,15 +396,27 @@ class People:
             self.use_first_name_in_plots = False
 
         if time_fmt_func is None:
-            self.time_formatter = FuncFormatter(self.seconds_to_hours_mins)
+            self.time_formatter = TIME_FORMATTER
         else:
-            self.time_formatter = FuncFormatter(time_fmt_func)
+            self.time_formatter = FuncFormatter(
+                lambda secs, pos: time_fmt_func(secs)
+            )
 
-    def seconds_to_hours_mins(self, secs: int) -> str:
-        """Convert seconds to H:MM format."""
-        hours = int(secs // 3600)
-        minutes = int((secs % 3600) // 60)
-        return "{:d}:{:02d}".format(hours, minutes)
+    def get_plot_names(self) -> list[str]:
+        """Get the name to label each person with in the plots. This is the
+        persons first name unless use_first_name_in_plots is False, in which
+        case it is their full name."""
+        if self.use_first_name_in_plots:
+            return [person.first_name for person in self.people]
+        return [person.name for person in self.people]
+
+    def get_delta_labels(self, times: np.ndarray, min_time: int) -> list[str]:
+        """Get the label of how far behind the fastest time each time is. The
+        fastest time gets an empty label."""
+        return [
+            "" if time == min_time else f"+{seconds_to_human_time(time - min_time)}"
+            for time in times
+        ]
 
     def plot_leg_as_bar(self, ax: Axes, leg_no: int) -> None:
         """Plot a bar for each person for a specified leg number on the xaxis
@@ -224,39 +431,37 @@ class People:
             The leg number to plot. This is an int value of either:
             `1`, `2`, `3` or `4`.
         """
-        times = []
-        for person in self.people:
-            time = person.get_leg_time(leg_no)
-            times.append(time)
-            name = person.first_name if self.use_first_name_in_plots else person.name
-            ax.bar(name, time, alpha=0.8)
-
-        for i, person in enumerate(self.people):
-            time = person.get_leg_time(leg_no)
-            ax.text(
-                i,
-                time,
-                seconds_to_human_time(time),
-                rotation=-90,
-                horizontalalignment="center",
-                verticalalignment="top",
-            )
-            if time == min(times):
-                continue
-            ax.text(
-                i,
-                time,
-                f"+{seconds_to_human_time(time - min(times))}",
-                horizontalalignment="center",
-                verticalalignment="bottom",
-            )
+        times = self.leg_times[:, leg_no - 1]
+        min_time = self.leg_min_times[leg_no - 1]
+        max_time = self.leg_max_times[leg_no - 1]
+
+        names = self.get_plot_names()
+        xs = np.arange(len(self.people))
+
+        bars = ax.bar(
+            xs,
+            times,
+            alpha=0.8,
+            color=self.colors,
+        )
+        ax.set_xticks(xs)
+        ax.set_xticklabels(names, rotation=-70)
 
-        ax.set_ylim(min(times) * 0.965, max(times) * 1.009)
-        ax.get_ylim()
-        ax.yaxis.set_ticks(np.linspace(*ax.get_ylim(), 15))
+        labels = ax.bar_label(
+            bars,
+            labels=[seconds_to_human_time(time) for time in times],
+            rotation=-90,
+        )
+        for label in labels:
+            label.set_verticalalignment("top")
+
+        ax.bar_label(bars, labels=self.get_delta_labels(times, min_time))
+
+        lower_limit = min_time * 0.965
+        upper_limit = max_time * 1.009
+        ax.set_ylim(lower_limit, upper_limit)
+        ax.yaxis.set_ticks(np.linspace(lower_limit, upper_limit, 15))
         ax.yaxis.set_major_formatter(self.time_formatter)
-        for tick in ax.get_xticklabels():
-            tick.set_rotation(-70)
 
         ax.set_title(f"Leg {leg_no}")
         ax.grid(alpha=0.3)
@@ -270,71 +475,91 @@ class People:
         ax: Axes
             The figure axes to plot the total time chart to.
         """
-        times = []
-        for i, person in enumerate(self.people):
-            time = person.total_time
-            times.append(time)
-            name = person.first_name if self.use_first_name_in_plots else person.name
-            ax.barh(name, time, alpha=0.8, color=f"C{i}")
-
-        for i, person in enumerate(self.people):
-            time = person.total_time
-            ax.text(
-                time,
-                i,
-                seconds_to_human_time(time),
-                horizontalalignment="right",
-                verticalalignment="center",
-            )
-            if time == min(times):
-                continue
-            ax.text(
-                time * 1.0005,
-                i,
-                f"+{seconds_to_human_time(time - min(times))}",
-                # rotation=-90,
-                horizontalalignment="left",
-                verticalalignment="center",
-            )
+        times = self.total_times
+        min_time = min(times)
+        max_time = max(times)
+
+        names = self.get_plot_names()
+        ys = np.arange(len(self.people))
+
+        bars = ax.barh(
+            ys,
+            times,
+            alpha=0.8,
+            color=self.colors,
+        )
+        ax.set_yticks(ys)
+        ax.set_yticklabels(names)
+
+        labels = ax.bar_label(
+            bars,
+            labels=[seconds_to_human_time(time) for time in times],
+        )
+        for label in labels:
+            label.set_horizontalalignment("right")
 
-        ax.set_xlim(min(times) * 0.99, max(times) * 1.005)
-        ax.get_xlim()
-        ax.xaxis.set_ticks(np.linspace(*ax.get_xlim(), 15))
+        ax.bar_label(bars, labels=self.get_delta_labels(times, min_time), padding=8)
+
+        lower_limit = min_time * 0.99
+        upper_limit = max_time * 1.005
+        ax.set_xlim(lower_limit, upper_limit)
+        ax.xaxis.set_ticks(np.linspace(lower_limit, upper_limit, 15))
         ax.xaxis.set_major_formatter(self.time_formatter)
 
         ax.set_title(f"Total Time")
         ax.set_xlabel("Time     (Hours : Mins)")
         ax.grid(alpha=0.3)
 
-    def plot(self) -> None:
-        """Plot the data for each of the 4 Legs and the overall."""
-        title = "Mighty_Hike"
-        fig = plt.figure(title, figsize=(16, 9))
-        plt.clf()
+    def plot(self, fig: Figure | None = None) -> None:
+        """Plot the data for each of the 4 Legs and the overall.
+
+        KwArgs
+        ------
+        fig: Figure | None = None
+            An optional figure to plot to. If this figure has already been
+            plotted to by this method its axes are cleared and reused rather
+            than being made again. When this is not defined the `Mighty_Hike`
+            figure is used, which pyplot reuses if it is still open.
+        """
+        if fig is None:
+            title = "Mighty_Hike"
+            fig = plt.figure(title, figsize=(16, 9))
+
         rows = 2
         cols = 4
-        grid = plt.GridSpec(
-            rows,
-            cols,
-            top=0.95,
-            bottom=0.05,
-            left=0.05,
-            right=0.99,
-            hspace=0.19,
-            wspace=0.25,
-        )
-
         axs: list[list[Axes]] = []
 
-        for row in range(1):
+        # Figures whose axes were made below are marked so their axes can be
+        # told apart from any other figure that happens to have 5 axes.
+        if getattr(fig, "mighty_hike_axes", None) == fig.axes:
+            for ax in fig.axes:
+                ax.clear()
+            axs.append(fig.axes[:cols])
+            axs.append(fig.axes[cols:])
+        else:
+            fig.clf()
+            grid = fig.add_gridspec(
+                rows,
+                cols,
+                top=0.95,
+                bottom=0.05,
+                left=0.05,
+                right=0.99,
+                hspace=0.19,
+                wspace=0.25,
+            )
+
+            for row in range(1):
+                ax_row = []
+                for col in range(cols):
+                    ax_row.append(fig.add_subplot(grid[row, col]))
+                axs.append(ax_row)
+
             ax_row = []
-            for col in range(cols):
-                ax_row.append(plt.subplot(grid[row, col]))
+            ax_row.append(fig.add_subplot(grid[1, 0:cols]))
             axs.append(ax_row)
 
-        ax_row = []
-        ax_row.append(plt.subplot(grid[1, 0:cols]))
-        axs.append(ax_row)
+            fig.mighty_hike_axes = list(fig.axes)
 
         for leg_no in range(1, 4 + 1):
             ax = axs[0][leg_no - 1]
@@ -345,12 +570,42 @@ class People:
 
         fig.savefig(f"MightHike_2024_plot")
         print("Saved plot as MightHike_2024_plot.png")
-        fig.show()
+        if matplotlib.get_backend().lower() != "agg":
+            fig.show()
+
+
+def new_session(use_cache: bool = True) -> requests.Session:
+    """Make a new session to request the results pages with.
+
+    KwArgs
+    ------
+    use_cache: bool = True
+        Whether the session should cache the pages it gets on disk in the
+        `mighty_hike_cache.sqlite` file. Cached pages are reused for 30 days
+        instead of being downloaded again.
+
+    Returns
+    -------
+    session: requests.Session
+        The new session.
+    """
+    if use_cache:
+        return requests_cache.CachedSession(
+            "mighty_hike_cache",
+            expire_after=timedelta(days=30),
+        )
+    return requests.Session()
+
+
+# Turns the split names on the stats page, e.g. `Pitstop 1`, into the
+# Person argument names, e.g. `pitstop_1`, once they are lower case.
+STATS_KEY_TRANSLATION = str.maketrans(" ", "_")
 
 
 def generate_person_from_race_nubmer(
     race_location: MightHikeLocation,
     race_number: int,
+    session: requests.Session | None = None,
 ) -> Person:
     """Generate a Person object from a race number looking up relevant times
     from online.
@@ -363,6 +618,14 @@ def generate_person_from_race_nubmer(
     race_number: int
         The race number of the person to add.
 
+    KwArgs
+    ------
+    session: requests.Session | None = None
+        An optional session to make the requests with. Sharing a session
+        between requests reuses the connection to the results site. When this
+        is not defined a new cached session is made for this race number. See
+        new_session() for more info.
+
     Returns
     -------
     person: Person
@@ -375,39 +638,56 @@ def generate_person_from_race_nubmer(
         base_url + f"Search.aspx?CId=8&RId={race_location.value}&S={race_number}"
     )
 
+    # Only close the session at the end if it was made here.
+    close_session = session is None
+    if session is None:
+        session = new_session()
+
+    requested_urls = [search_results_page_url]
+
     try:
         #######################################################################
-        search_results_page = requests.get(search_results_page_url)
-        search_results_soup = BeautifulSoup(search_results_page.content, "html.parser")
+        with session.get(search_results_page_url, stream=True) as search_results_page:
+            search_results_page.raw.decode_content = True
+            search_results_soup = BeautifulSoup(
+                search_results_page.raw,
+                "lxml",
+                parse_only=SoupStrainer(id="ctl00_Content_Main_grdSearch"),
+            )
 
-        result = search_results_soup.find(
-            "table", {"id": "ctl00_Content_Main_grdSearch"}
-        )
+        result = search_results_soup.find("table", id="ctl00_Content_Main_grdSearch")
 
-        person_name = result.find_all("a")[0].get_text()
-        href_to_stats_page = result.find_all("a", href=True)[0]["href"]
+        person_name = result.find("a").get_text()
+        href_to_stats_page = result.find("a", href=True)["href"]
 
         stats_page_url = base_url + href_to_stats_page
+        requested_urls.append(stats_page_url)
 
         #######################################################################
-        stats_page_result = requests.get(stats_page_url)
-        stats_page_soup = BeautifulSoup(stats_page_result.content, "html.parser")
+        with session.get(stats_page_url, stream=True) as stats_page_result:
+            stats_page_result.raw.decode_content = True
+            stats_page_soup = BeautifulSoup(
+                stats_page_result.raw,
+                "lxml",
+                parse_only=SoupStrainer(id="ctl00_Content_Main_divSplitGrid"),
+            )
 
-        result = stats_page_soup.find("div", {"id": "ctl00_Content_Main_divSplitGrid"})
+        result = stats_page_soup.find("div", id="ctl00_Content_Main_divSplitGrid")
         table = result.find("table")
-        stats_table_rows = table.find_all("tr")[1:]
+        # The first two cells of every row after the header row are the
+        # name of the split and the time for it.
+        stats_table_datas = iter(
+            table.select("tr:not(:first-child) > td:nth-of-type(-n+2)")
+        )
 
         data_dict: dict[str, Any] = {}
 
         data_dict["name"] = person_name
         data_dict["race_number"] = race_number
 
-        for row_number, table_row in enumerate(stats_table_rows):
-            table_datas = table_row.find_all("td")[:2]
-            key = str(table_datas[0].get_text())
-            key = key.lower()
-            key = key.replace(" ", "_")
-            val = str(table_datas[1].get_text())
+        for key_data, val_data in zip(stats_table_datas, stats_table_datas):
+            key = key_data.get_text().lower().translate(STATS_KEY_TRANSLATION)
+            val = val_data.get_text()
             data_dict[key] = val
 
         person = Person(**data_dict)
@@ -417,36 +697,71 @@ def generate_person_from_race_nubmer(
         return person
 
     except Exception as e:
+        # Don't keep pages that could not be parsed, e.g. results that are
+        # not posted yet, so the next run gets them from the site again.
+        if isinstance(session, requests_cache.CachedSession):
+            session.cache.delete(urls=requested_urls)
         raise RuntimeError(
             f"Could not find relevant data for race_number {race_number}."
         )
 
+    finally:
+        if close_session:
+            session.close()
+
 
 def generate_people_from_race_nubmers(
     race_location: MightHikeLocation,
     race_numbers: Sequence[int],
+    use_cache: bool = True,
 ) -> People:
-    """Generate a Person object from a race number looking up relevant times
-    from online.
+    """Generate a People object from race numbers looking up relevant times
+    from online. The race numbers are looked up in parallel. Any race number
+    that cannot be looked up is reported and left out of the People. If none
+    of the race numbers can be looked up a RuntimeError is raised.
 
     Parameters
     ----------
     race_location: MightHikeLocation
         The location of the Mighty Hike.
 
-    race_number: int
-        The race number of the person to add.
+    race_numbers: Sequence[int]
+        The race numbers of the people to add.
+
+    KwArgs
+    ------
+    use_cache: bool = True
+        Whether to reuse results pages cached on disk by previous runs. See
+        new_session() for more info.
 
     Returns
     -------
-    person: Person
-        The Person object generated.
+    people: People
+        The People object generated.
     """
 
-    people_list = []
-    for race_number in race_numbers:
-        person = generate_person_from_race_nubmer(race_location, race_number)
-        people_list.append(person)
+    def try_generate_person(race_number: int) -> Person | None:
+        try:
+            return generate_person_from_race_nubmer(
+                race_location, race_number, session=session
+            )
+        except RuntimeError as e:
+            print(e)
+            return None
+
+    with new_session(use_cache=use_cache) as session:
+        max_workers = max(1, min(16, len(race_numbers)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            people_list = [
+                person
+                for person in executor.map(try_generate_person, race_numbers)
+                if person is not None
+            ]
+
+    if len(people_list) == 0:
+        raise RuntimeError(
+            f"Could not find relevant data for any of the race_numbers {race_numbers}."
+        )
 
     people = People(people_list)
 
@@ -495,10 +810,11 @@ def ask_for_race_number() -> int:
         user_input = input(ask_string)
         try:
             race_number = int(user_input)
-            assert race_number >= 0
+            if race_number < 0:
+                raise ValueError(f"race_number {race_number} is negative.")
             invalid_input = False
             return race_number
-        except:
+        except ValueError:
             ask_string = "Could not parse into an race_number.\nPlease enter a valid race number:\n"
             pass
     raise RuntimeError
@@ -532,6 +848,8 @@ def ask_for_race_numbers() -> list[int]:
 
 
 def main():
+    use_cache = "--no-cache" not in sys.argv
+
     print("+---------------------+")
     print("|  Might Hike Plotter |")
     print("+---------------------+")
@@ -544,7 +862,9 @@ def main():
     location = ask_for_location()
     race_numbers = ask_for_race_numbers()
 
-    people = generate_people_from_race_nubmers(location, race_numbers)
+    people = generate_people_from_race_nubmers(
+        location, race_numbers, use_cache=use_cache
+    )
     people.plot()
 
 